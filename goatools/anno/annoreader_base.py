@@ -300,8 +300,8 @@ class AnnoReaderBase(object):
         for ntd in self.associations:
             # print(ntd)
             qual = ntd.Qualifier
-            assert isinstance(qual, set), '{NAME}: QUALIFIER MUST BE A LIST: {NT}'.format(
-                NAME=self.name, NT=ntd)
+            assert isinstance(qual, (set, frozenset)), \
+                '{NAME}: QUALIFIER MUST BE A SET: {NT}'.format(NAME=self.name, NT=ntd)
             assert qual != set(['']), ntd
             assert qual != set(['-']), ntd
             assert 'always' not in qual, 'SPEC SAID IT WOULD BE THERE'
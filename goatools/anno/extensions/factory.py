@@ -24,12 +24,40 @@ __author__ = "DV Klopfenstein"
 
 def get_extensions(extstr):
     """Return zero or greater Annotation Extensions, given a line of text."""
+    if not extstr:
+        return None
+    return AnnotationExtensions(_get_exts(extstr))
+
+
+def get_extensions_lazy(extstr):
+    """Return zero or greater Annotation Extensions, parsed from text when first used."""
+    if not extstr:
+        return None
+    return AnnotationExtensionsLazy(extstr)
+
+
+class AnnotationExtensionsLazy(AnnotationExtensions):
+    """Annotation Extensions for one gene product, parsed from text when first used."""
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, extstr):
+        self.extstr = extstr
+        self._exts = None
+
+    @property
+    def exts(self):
+        """Annotation Extensions, parsed from text the first time they are used"""
+        if self._exts is None:
+            self._exts = _get_exts(self.extstr)
+        return self._exts
+
+
+def _get_exts(extstr):
+    """Return a list of Annotation Extension groups, given a line of text."""
     # Extension examples:
     #   has_direct_input(UniProtKB:P37840),occurs_in(GO:0005576)
     #   part_of(UBERON:0006618),part_of(UBERON:0002302)
     #   occurs_in(CL:0000988)|occurs_in(CL:0001021)
-    if not extstr:
-        return None
     exts = []
     for ext_lst in extstr.split('|'):
         grp = []
@@ -41,7 +69,7 @@ def get_extensions(extstr):
                 # Ignore improperly formatted Extensions
                 sys.stdout.write('BAD Extension({E})\n'.format(E=ext))
         exts.append(grp)
-    return AnnotationExtensions(exts)
+    return exts
 
 
 # Copyright (C) 2016-2019, DV Klopfenstein, H Tang. All rights reserved."
@@ -72,4 +72,11 @@ class GafReader(AnnoReaderBase):
         return nts
 
 
+def read_gaf_iter(fin_gaf, chunksize=1000000, prt=sys.stdout, namespaces=None,
+                  allow_missing_symbol=False, fields=None):
+    """Read a GAF file, yielding lists of up to chunksize annotation namedtuples."""
+    ini = InitAssc(fin_gaf)
+    return ini.init_associations(False, prt, namespaces, allow_missing_symbol, chunksize, fields)
+
+
 # Copyright (C) 2016-2019, DV Klopfenstein, H Tang. All rights reserved."
@@ -9,107 +9,304 @@ import os
 import re
 import collections as cx
 import datetime
+from functools import lru_cache
+from itertools import chain
+from itertools import islice
+from operator import itemgetter
 from goatools.anno.annoreader_base import AnnoReaderBase
 from goatools.anno.init.utils import get_date_yyyymmdd
-from goatools.anno.extensions.factory import get_extensions
+from goatools.anno.init.utils import gc_paused
+from goatools.anno.extensions.factory import get_extensions_lazy
 
 __copyright__ = "Copyright (C) 2016-present, DV Klopfenstein, H Tang. All rights reserved."
 __author__ = "DV Klopfenstein"
 
+_EMPTY_FS = frozenset()
+
+# Number of GAF lines converted in each batch when all annotations are returned at once
+_CHUNKSIZE = 100000
+
 
 # pylint: disable=too-few-public-methods
 class InitAssc:
     """Read annotation file and store a list of namedtuples."""
 
+    bufsize = 8*1024*1024  # Read buffer size in bytes
+
     def __init__(self, fin_gaf):
         self.fin_gaf = fin_gaf
         self.hdr = None
         self.datobj = None
 
     # pylint: disable=too-many-arguments
-    def init_associations(self, hdr_only, prt, namespaces, allow_missing_symbol):
-        """Read GAF file. Store annotation data in a list of namedtuples."""
+    def init_associations(self, hdr_only, prt, namespaces, allow_missing_symbol, chunksize=None,
+                          fields=None):
+        """Read GAF file. Store annotation data in a list of namedtuples.
+
+        If chunksize is given, return an iterator over lists of up to chunksize namedtuples.
+        If fields is given (e.g., ['DB_ID', 'GO_ID']), only those GAF fields are converted
+        and stored in the namedtuples.
+        """
         import timeit
         tic = timeit.default_timer()
-        nts = self._read_gaf_nts(hdr_only, namespaces, allow_missing_symbol)
+        if chunksize and not hdr_only:
+            return self._iter_associations(
+                tic, prt, namespaces, allow_missing_symbol, chunksize, fields)
+        with gc_paused():
+            nts = self._read_gaf_nts(hdr_only, namespaces, allow_missing_symbol, fields)
         # GAF file has been read
+        self._prt_read_summary(prt, tic, len(nts), namespaces)
+        self._prt_error_summary()
+        return nts
+        #### return self.evobj.sort_nts(nts, 'Evidence_Code')
+
+    @staticmethod
+    def init_associations_many(fin_gafs, workers=None, prt=sys.stdout, namespaces=None,
+                               allow_missing_symbol=False, fields=None):
+        """Read many GAF files in parallel, one file per process.
+
+        Return a list of annotation lists, one list per GAF file.
+        """
+        import timeit
+        from concurrent.futures import ProcessPoolExecutor
+        tic = timeit.default_timer()
+        args = [(fin_gaf, namespaces, allow_missing_symbol, fields) for fin_gaf in fin_gafs]
+        nts_lst = []
+        with gc_paused(), ProcessPoolExecutor(max_workers=workers) as executor:
+            # Namedtuple classes made at run-time can not be pickled, so make namedtuples here
+            for ver, gafvals_lst in executor.map(_read_gafvals, args):
+                if fields is not None:
+                    flds = fields
+                else:
+                    flds = GafData.gaf_columns[ver] if ver is not None else []
+                ntobj = cx.namedtuple("ntgafobj", " ".join(flds))
+                nts_lst.append(list(map(ntobj._make, gafvals_lst)))
+        if prt:
+            prt.write('HMS:{HMS} {N:7,} annotations READ FROM {M} GAF FILES {NSs}\n'.format(
+                N=sum(len(nts) for nts in nts_lst), M=len(nts_lst),
+                NSs=','.join(namespaces) if namespaces else '',
+                HMS=str(datetime.timedelta(seconds=(timeit.default_timer()-tic)))))
+        return nts_lst
+
+    def init_dataframe(self, prt=sys.stdout, namespaces=None):
+        """Read GAF file. Store annotation data in a pandas DataFrame."""
+        import timeit
+        tic = timeit.default_timer()
+        with gc_paused():
+            dfr = self._read_gaf_df(namespaces)
+        self._prt_read_summary(prt, tic, len(dfr), namespaces)
+        return dfr
+
+    # pylint: disable=too-many-arguments
+    def init_columns(self, prt=sys.stdout, namespaces=None, allow_missing_symbol=False,
+                     chunksize=_CHUNKSIZE, fields=None):
+        """Read GAF file. Store annotation data column-by-column in a GafColumns object."""
+        import timeit
+        tic = timeit.default_timer()
+        columns = None
+        for gafvals_lst in self._iter_gafvals(namespaces, allow_missing_symbol, chunksize, fields):
+            if columns is None:
+                columns = GafColumns(self.datobj.fields)
+            columns.extend(gafvals_lst)
+        if columns is None:
+            columns = GafColumns(self.datobj.fields if self.datobj else [])
+        self._prt_read_summary(prt, tic, len(columns), namespaces)
+        self._prt_error_summary()
+        return columns
+
+    # pylint: disable=too-many-arguments
+    def _iter_associations(self, tic, prt, namespaces, allow_missing_symbol, chunksize, fields):
+        """Yield lists of namedtuples. Report totals after the last list is yielded."""
+        num_nts = 0
+        for nts in self._iter_gaf_nts(namespaces, allow_missing_symbol, chunksize, fields):
+            num_nts += len(nts)
+            yield nts
+        self._prt_read_summary(prt, tic, num_nts, namespaces)
+        self._prt_error_summary()
+
+    def _prt_read_summary(self, prt, tic, num_nts, namespaces):
+        """Print the number of annotations read and the time it took to read them."""
+        import timeit
         if prt:
             prt.write('HMS:{HMS} {N:7,} annotations READ: {ANNO} {NSs}\n'.format(
-                N=len(nts), ANNO=self.fin_gaf,
+                N=num_nts, ANNO=self.fin_gaf,
                 NSs=','.join(namespaces) if namespaces else '',
                 HMS=str(datetime.timedelta(seconds=(timeit.default_timer()-tic)))))
-        # If there are illegal GAF lines ...
+
+    def _prt_error_summary(self):
+        """If there are illegal GAF lines, print a summary of them."""
         if self.datobj:
             if self.datobj.ignored or self.datobj.illegal_lines:
-                self.datobj.prt_error_summary(self.fin_gaf)
-        return nts
-        #### return self.evobj.sort_nts(nts, 'Evidence_Code')
+                fout_log = '{GAF}.log'.format(GAF=self.fin_gaf)
+                self.datobj.prt_error_summary(fout_log, self.fin_gaf)
+
+    def _read_gaf_df(self, namespaces):
+        """Read GAF file using the pandas C parser. Convert values column-by-column."""
+        import csv
+        import pandas as pd
+        ver = None
+        hdrobj = GafHdr()
+        lnum = 0
+        with self._open_gaf() as ifstrm:
+            # Read header
+            pos = ifstrm.tell()
+            line = ifstrm.readline()
+            while line[:1] == '!':
+                if ver is None and line[1:13] == 'gaf-version:':
+                    ver = line[13:].strip()
+                hdrobj.chkaddhdr(line)
+                lnum += 1
+                pos = ifstrm.tell()
+                line = ifstrm.readline()
+            self.hdr = hdrobj.get_hdr()
+            datobj = GafData(ver)
+            # Read data
+            ifstrm.seek(pos)
+            dfr = pd.read_csv(ifstrm, sep='\t', header=None, names=datobj.flds,
+                              dtype=str, na_filter=False, quoting=csv.QUOTE_NONE,
+                              index_col=False, engine='c')
+        return datobj.get_gafvals_df(dfr, namespaces, lnum+1)
 
     # pylint: disable=too-many-locals
-    def _read_gaf_nts(self, hdr_only, namespaces, allow_missing_symbol):
+    def _read_gaf_nts(self, hdr_only, namespaces, allow_missing_symbol, fields=None):
         """Read GAF file. Store annotation data in a list of namedtuples."""
         nts = []
-        ver = None
-        hdrobj = GafHdr()
         datobj = None
-        # pylint: disable=not-callable
-        ntobj_make = None
-        get_gafvals = None
         lnum = -1
         line = ''
         get_all_nss = namespaces is None or namespaces == {'BP', 'MF', 'CC'}
         try:
-            with open(self.fin_gaf) as ifstrm:
-                for lnum, line in enumerate(ifstrm, 1):
-                    # Read data
-                    if get_gafvals:
-                        # print(lnum, line)
-                        flds = line.split('\t')
-                        nspc = GafData.aspect2ns[flds[8]]  # 8 GAF Aspect -> BP, MF, or CC
-                        if get_all_nss or nspc in namespaces:
-                            gafvals = get_gafvals(flds, nspc)
-                            if gafvals:
-                                nts.append(ntobj_make(gafvals))
-                            else:
-                                datobj.ignored.append((lnum, line))
-                    # Read header
-                    elif datobj is None:
-                        if line[0] == '!':
-                            if ver is None and line[1:13] == 'gaf-version:':
-                                ver = line[13:].strip()
-                            hdrobj.chkaddhdr(line)
+            with self._open_gaf() as ifstrm:
+                ver, lnum, line = self._read_hdr(ifstrm)
+                if hdr_only or line is None:
+                    return nts
+                datobj = GafData(ver, allow_missing_symbol, fields)
+                get_gafvals = datobj.get_gafvals
+                # _make is kept rather than calling tuple.__new__ directly: it is only ~20ns slower
+                # per line and its length check catches GAF lines having extra columns
+                ntobj_make = datobj.get_ntobj()._make
+                aspect2ns = GafData.aspect2ns
+                # Appending is faster than filling a preallocated list by index: list growth
+                # is amortized in C, while index bookkeeping adds Python bytecode to every line
+                nts_append = nts.append
+                # Read data, starting with the first line after the header
+                for lnum, line in chain([(lnum, line)], enumerate(ifstrm, lnum+1)):
+                    flds = line.split('\t')
+                    nspc = aspect2ns[flds[8]]  # 8 GAF Aspect -> BP, MF, or CC
+                    if get_all_nss or nspc in namespaces:
+                        gafvals = get_gafvals(flds, nspc)
+                        if gafvals:
+                            nts_append(ntobj_make(gafvals))
                         else:
-                            self.hdr = hdrobj.get_hdr()
-                            if hdr_only:
-                                return nts
-                            datobj = GafData(ver, allow_missing_symbol)
-                            get_gafvals = datobj.get_gafvals
-                            ntobj_make = datobj.get_ntobj()._make
-                            self._add_data0(nts, lnum, line, get_all_nss, namespaces, datobj)
+                            datobj.ignored.append((lnum, line))
         # pylint: disable=broad-except
         except Exception as inst:
-            import traceback
-            traceback.print_exc()
-            sys.stderr.write("\n  **FATAL-gaf: {MSG}\n\n".format(MSG=str(inst)))
-            sys.stderr.write("**FATAL-gaf: {FIN}[{LNUM}]:\n{L}".format(
-                FIN=self.fin_gaf, L=line, LNUM=lnum))
-            if datobj is not None:
-                datobj.prt_line_detail(sys.stdout, line)
-            sys.exit(1)
+            self._prt_fatal(inst, lnum, line, datobj)
         self.datobj = datobj
         return nts
 
+    def _iter_gaf_nts(self, namespaces, allow_missing_symbol, chunksize, fields=None):
+        """Read GAF file. Yield annotation data in lists of up to chunksize namedtuples."""
+        ntobj_make = None
+        for gafvals_lst in self._iter_gafvals(namespaces, allow_missing_symbol, chunksize, fields):
+            if ntobj_make is None:
+                ntobj_make = self.datobj.get_ntobj()._make
+            with gc_paused():
+                nts = list(map(ntobj_make, gafvals_lst))
+            yield nts
+
+    def _iter_gafvals(self, namespaces, allow_missing_symbol, chunksize, fields=None):
+        """Read GAF file. Yield annotation data in lists of up to chunksize lists of GAF values."""
+        datobj = None
+        lnum = -1
+        line = ''
+        try:
+            with self._open_gaf() as ifstrm:
+                ver, lnum, line = self._read_hdr(ifstrm)
+                if line is None:
+                    return
+                datobj = GafData(ver, allow_missing_symbol, fields)
+                self.datobj = datobj
+                # Read data, starting with the first line after the header
+                lines = chain([line], ifstrm)
+                batch = list(islice(lines, chunksize))
+                while batch:
+                    try:
+                        with gc_paused():
+                            gafvals_lst = datobj.get_gafvals_batch(batch, namespaces)
+                    except Exception:
+                        # Find the line in this batch which can not be read, so it is reported
+                        idx = self._get_idx_bad_line(datobj, batch, namespaces)
+                        lnum += idx
+                        line = batch[idx]
+                        raise
+                    lnum += len(batch)
+                    yield gafvals_lst
+                    batch = list(islice(lines, chunksize))
+        # pylint: disable=broad-except
+        except Exception as inst:
+            self._prt_fatal(inst, lnum, line, datobj)
+
     @staticmethod
-    def _add_data0(nts, lnum, line, get_all_nss, namespaces, datobj):
-        """Do tasks upon finding the end of the header"""
-        flds = line.split('\t')
-        nspc = GafData.aspect2ns[flds[8]]  # 8 GAF Aspect -> BP, MF, or CC
-        if get_all_nss or nspc in namespaces:
-            gafvals = datobj.get_gafvals(flds, nspc)
-            if gafvals:
-                nts.append(datobj.get_ntobj()._make(gafvals))
-            else:
-                datobj.ignored.append((lnum, line))
+    def _get_idx_bad_line(datobj, batch, namespaces):
+        """Return the index of the first line in a batch which can not be read."""
+        for idx, line in enumerate(batch):
+            # pylint: disable=broad-except
+            try:
+                datobj.get_gafvals_batch([line], namespaces)
+            except Exception:
+                return idx
+        return 0
+
+    def _open_gaf(self):
+        """Open the GAF with a large read buffer to reduce the number of read system calls."""
+        # GAFs are ASCII, but non-ASCII text is seen in the field (e.g., DB_Name).
+        # UTF-8 decodes ASCII text as fast as the ASCII codec does.
+        return open(self.fin_gaf, buffering=self.bufsize, encoding='utf-8')
+
+    def _read_hdr(self, ifstrm):
+        """Read GAF header.
+
+        Return the GAF version and the line number and text of the 1st data line.
+        """
+        ver = None
+        hdrobj = GafHdr()
+        lnum = 0
+        line = None
+        for lnum, line in enumerate(ifstrm, 1):
+            if line[0] != '!':
+                break
+            if ver is None and line[1:13] == 'gaf-version:':
+                ver = line[13:].strip()
+            hdrobj.chkaddhdr(line)
+        else:
+            # No annotations found after the header
+            line = None
+        self.hdr = hdrobj.get_hdr()
+        return ver, lnum, line
+
+    def _prt_fatal(self, inst, lnum, line, datobj):
+        """Print the GAF line which could not be read and exit."""
+        import traceback
+        traceback.print_exc()
+        sys.stderr.write("\n  **FATAL-gaf: {MSG}\n\n".format(MSG=str(inst)))
+        sys.stderr.write("**FATAL-gaf: {FIN}[{LNUM}]:\n{L}".format(
+            FIN=self.fin_gaf, L=line, LNUM=lnum))
+        if datobj is not None and line is not None:
+            datobj.prt_line_detail(sys.stdout, line)
+        sys.exit(1)
+
+
+def _read_gafvals(args):
+    """Read one GAF file in a worker process. Return its GAF version and annotation values."""
+    fin_gaf, namespaces, allow_missing_symbol, fields = args
+    ini = InitAssc(fin_gaf)
+    gafvals_all = []
+    # pylint: disable=protected-access
+    for gafvals_lst in ini._iter_gafvals(namespaces, allow_missing_symbol, _CHUNKSIZE, fields):
+        gafvals_all.extend(gafvals_lst)
+    ini._prt_error_summary()
+    return (ini.datobj.ver if ini.datobj else None), gafvals_all
 
 
 class GafData:
@@ -120,8 +317,16 @@ class GafData:
     req_str = ["REQ", "REQ", "REQ", "", "REQ", "REQ", "REQ", "", "REQ", "", "",
                "REQ", "REQ", "REQ", "REQ", "", ""]
 
+    # Looking up the 1-letter Aspect in a dict is as fast as indexing a lookup table
+    # by ord(Aspect) because str hashes are cached. The dict also raises a KeyError
+    # on an unexpected Aspect rather than silently storing an empty namespace.
     aspect2ns = {'P':'BP', 'F':'MF', 'C':'CC'}
 
+    cmptaxon = re.compile(r'(?:NCBI)?[Tt]axon:(\d*)')  # taxon:9606  NCBITaxon:9606
+
+    # Dates repeat heavily across annotations in a GAF, so reuse date objects
+    _parse_date = staticmethod(lru_cache(maxsize=4096)(get_date_yyyymmdd))
+
     gafhdr = [ #           Col Req?     Cardinality    Example
         #                  --- -------- -------------- -----------------
         'DB',             #  0 required 1              UniProtKB
@@ -158,15 +363,25 @@ class GafData:
         "2.0" : 17,
         "1.0" : 15}
 
-    def __init__(self, ver, allow_missing_symbol=False):
+    def __init__(self, ver, allow_missing_symbol=False, fields=None):
         self.ver = ver
         self.is_long = self._init_is_long(ver)
         self.flds = self.gaf_columns[self.ver]
+        # GAF fields stored in each annotation: all fields or a user-requested subset
+        self.fields = self.flds if fields is None else list(fields)
         # pylint: disable=line-too-long
         self.req1 = self.spec_req1 if not allow_missing_symbol else [i for i in self.spec_req1 if i != 2]
+        self._get_req1 = itemgetter(*self.req1)  # Returns a tuple of the required values
         # Store information about illegal lines seen in a GAF file from the field
         self.ignored = []  # Illegal GAF lines that are ignored (e.g., missing an ID)
-        self.illegal_lines = cx.defaultdict(list)  # GAF lines that are missing information (missing taxon)
+        # GAF lines that are missing information (missing taxon). Each error is stored as
+        # (lnum, pattern, kws) and formatted only when the error log is written.
+        self.illegal_lines = cx.defaultdict(list)
+        # Convert fields from string to preferred format, specialized for this GAF version
+        if fields is None:
+            self.get_gafvals = self._init_get_gafvals()
+        else:
+            self.get_gafvals = self._init_get_gafvals_subset(self.fields)
 
     def _init_is_long(self, ver):
         """If the GAF version is 2.0 or 2.1, the GAF format is the long format (2 more cols)"""
@@ -184,118 +399,260 @@ class GafData:
             'DB': 'database',        #  0 required 1              UniProtKB
             'DB_ID': 1,              #  1 required 1              P12345
             'DB_Symbol': 'Symbol1',  #  2 required 1              PHO3
-            'Qualifier': set(),      #  3 optional 0 or greater   NOT
+            'Qualifier': _EMPTY_FS,  #  3 optional 0 or greater   NOT
             'GO_ID': 'GO:0000001',   #  4 required 1              GO:0003993
-            'DB_Reference': {'GO_REF:0000001',},   #  5 required 1 or greater   PMID:2676709
+            'DB_Reference': frozenset(['GO_REF:0000001']),  #  5 required 1 or greater
             'Evidence_Code': 'IDA',  #  6 required 1              IMP
-            'With_From': set(),      #  7 optional 0 or greater   GO:0000346
+            'With_From': _EMPTY_FS,  #  7 optional 0 or greater   GO:0000346
             'NS': 'BP',              #  8 required 1              P->BP  F->MF  C->CC
-            'DB_Name': set(),        #  9 optional 0 or 1         Toll-like receptor 4
-            'DB_Synonym': set(),     # 10 optional 0 or greater   hToll|Tollbooth
+            'DB_Name': _EMPTY_FS,    #  9 optional 0 or 1         Toll-like receptor 4
+            'DB_Synonym': _EMPTY_FS, # 10 optional 0 or greater   hToll|Tollbooth
             'DB_Type': 'protein',    # 11 required 1              protein
             'Taxon': [9606],         # 12 required 1 or 2         taxon:9606
             'Date': datetime.datetime.now().date(), # 13 required 1              20090118
             'Assigned_By': 'user',   # 14 required 1              SGD
-            'Extension': set(),      # 15 optional 0 or greater part_of(CL:0000576)
-            'Gene_Product_Form_ID':set(), # 16 optional 0 or 1       UniProtKB:P12345-2
+            'Extension': None,       # 15 optional 0 or greater part_of(CL:0000576)
+            'Gene_Product_Form_ID':_EMPTY_FS, # 16 optional 0 or 1       UniProtKB:P12345-2
         }
 
     def chk(self, annotations, fout_err):
-        """Check annotations."""
-        for idx, ntd in enumerate(annotations):
-            self._chk_fld(ntd, "Qualifier")        # optional 0 or greater
-            self._chk_fld(ntd, "DB_Reference", 1)  # required 1 or greater
-            self._chk_fld(ntd, "With_From")        # optional 0 or greater
-            self._chk_fld(ntd, "DB_Name", 0, 1)    # optional 0 or 1
-            self._chk_fld(ntd, "DB_Synonym")       # optional 0 or greater
-            self._chk_fld(ntd, "Taxon", 1, 2)
+        """Check annotations. Annotations having values which are fixed are replaced in the list."""
+        for idx, ntd_orig in enumerate(annotations):
+            ntd = self._chk_fld(ntd_orig, "Qualifier")   # optional 0 or greater
+            ntd = self._chk_fld(ntd, "DB_Reference", 1)  # required 1 or greater
+            ntd = self._chk_fld(ntd, "With_From")        # optional 0 or greater
+            ntd = self._chk_fld(ntd, "DB_Name", 0, 1)    # optional 0 or 1
+            ntd = self._chk_fld(ntd, "DB_Synonym")       # optional 0 or greater
+            ntd = self._chk_fld(ntd, "Taxon", 1, 2)
+            if ntd is not ntd_orig:
+                annotations[idx] = ntd
             flds = list(ntd)
             self._chk_qty_eq_1(flds)
             # self._chk_qualifier(ntd.Qualifier, flds, idx)
             if not ntd.Taxon or len(ntd.Taxon) not in {1, 2}:
                 self.illegal_lines['BAD TAXON'].append(
-                    (idx, '**{I}) TAXON: {NT}'.format(I=idx, NT=ntd)))
+                    (idx, '**{I}) TAXON: {NT}', {'I':idx, 'NT':ntd}))
         if self.illegal_lines:
             self.prt_error_summary(fout_err)
         return not self.illegal_lines
 
     def get_ntobj(self):
         """Get namedtuple object specific to version"""
-        return cx.namedtuple("ntgafobj", " ".join(self.flds))
-
-    def get_gafvals(self, flds, nspc):
-        """Convert fields from string to preferred format for GAF ver 2.1 and 2.0."""
-        flds[3] = self._get_qualifier(flds[3])  # 3 Qualifier
-        flds[5] = self._get_set(flds[5])     #  5 DB_Reference
-        flds[7] = self._get_set(flds[7])     #  7 With_From
-        flds[8] = nspc                       #  8 GAF Aspect field converted to BP, MF, or CC
-        flds[9] = self._get_set(flds[9])     #  9 DB_Name
-        flds[10] = self._get_set(flds[10])   # 10 DB_Synonym
-        flds[12] = self._do_taxons(flds[12])   # 12 Taxon
-        flds[13] = get_date_yyyymmdd(flds[13]) # 13 Date   20190406
+        return cx.namedtuple("ntgafobj", " ".join(self.fields))
+
+    def _init_get_gafvals(self):
+        """Return a function which converts GAF fields, specialized for GAF ver 2.x or 1.0."""
+        # Conversions are done in one pass with the helpers inlined. Empty fields are common
+        # in optional columns, so they are checked here before calling the (cached) helpers.
+        # Helpers are bound to local names so each use is a fast local lookup.
+        get_qualifier = self._get_qualifier
+        get_set = self._get_set
+        parse_date = self._parse_date
+        get_extensions = self._get_extensions
+        get_taxons = self._get_taxons
+        empty = _EMPTY_FS
+        # DB, Evidence_Code, DB_Type, and Assigned_By have a few values repeated on every line.
+        # Interning them stores one copy of each value rather than one copy per annotation.
+        intern = sys.intern
+
+        def get_gafvals_v2(flds, nspc):
+            """Convert fields from string to preferred format for GAF ver 2.1 and 2.0."""
+            flds[0] = intern(flds[0])                       #  0 DB
+            val = flds[3]
+            flds[3] = get_qualifier(val) if val else empty  #  3 Qualifier
+            flds[5] = get_set(flds[5])                      #  5 DB_Reference
+            flds[6] = intern(flds[6])                       #  6 Evidence_Code
+            val = flds[7]
+            flds[7] = get_set(val) if val else empty        #  7 With_From
+            flds[8] = nspc                     #  8 GAF Aspect field converted to BP, MF, or CC
+            val = flds[9]
+            flds[9] = get_set(val) if val else empty        #  9 DB_Name
+            val = flds[10]
+            flds[10] = get_set(val) if val else empty       # 10 DB_Synonym
+            flds[11] = intern(flds[11])                     # 11 DB_Type
+            flds[12] = list(get_taxons(flds[12]))           # 12 Taxon: taxon:9606 -> 9606
+            flds[13] = parse_date(flds[13])                 # 13 Date   20190406
+            flds[14] = intern(flds[14])                     # 14 Assigned_By
+            # Version 2.x has these additional fields not found in v1.0
+            val = flds[15]
+            flds[15] = get_extensions(val) if val else None  # 15 Extension
+            val = flds[16].rstrip()
+            flds[16] = get_set(val) if val else empty       # 16 Gene_Product_Form_ID
+            return flds
+
+        def get_gafvals_v1(flds, nspc):
+            """Convert fields from string to preferred format for GAF ver 1.0."""
+            flds[0] = intern(flds[0])                       #  0 DB
+            val = flds[3]
+            flds[3] = get_qualifier(val) if val else empty  #  3 Qualifier
+            flds[5] = get_set(flds[5])                      #  5 DB_Reference
+            flds[6] = intern(flds[6])                       #  6 Evidence_Code
+            val = flds[7]
+            flds[7] = get_set(val) if val else empty        #  7 With_From
+            flds[8] = nspc                     #  8 GAF Aspect field converted to BP, MF, or CC
+            val = flds[9]
+            flds[9] = get_set(val) if val else empty        #  9 DB_Name
+            val = flds[10]
+            flds[10] = get_set(val) if val else empty       # 10 DB_Synonym
+            flds[11] = intern(flds[11])                     # 11 DB_Type
+            flds[12] = list(get_taxons(flds[12]))           # 12 Taxon: taxon:9606 -> 9606
+            flds[13] = parse_date(flds[13])                 # 13 Date   20190406
+            flds[14] = get_set(flds[14].rstrip())           # 14 Assigned_By
+            return flds
+
+        return get_gafvals_v2 if self.is_long else get_gafvals_v1
+
+    def _init_get_gafvals_subset(self, fields):
+        """Return a function which gets and converts only the requested GAF fields."""
+        fld2col = {fld:col for col, fld in enumerate(self.flds)}
+        unknown = [fld for fld in fields if fld not in fld2col]
+        if unknown:
+            raise RuntimeError('UNKNOWN GAF{V} FIELDS({U}). EXPECTED: {E}'.format(
+                V=self.ver, U=' '.join(unknown), E=' '.join(self.flds)))
+        cols = [fld2col[fld] for fld in fields]
+        col2cnv = self._get_col2cnv()
+        # Only fields which are converted or interned need a function
+        idx_cnvs = [(idx, col2cnv[col]) for idx, col in enumerate(cols) if col in col2cnv]
+        get_vals = itemgetter(*cols)
+        one_fld = len(cols) == 1
+
+        def get_gafvals_subset(flds, nspc):
+            """Get and convert the requested GAF fields."""
+            flds[8] = nspc                     #  8 GAF Aspect field converted to BP, MF, or CC
+            vals = [get_vals(flds)] if one_fld else list(get_vals(flds))
+            for idx, cnv in idx_cnvs:
+                vals[idx] = cnv(vals[idx])
+            return vals
+
+        return get_gafvals_subset
+
+    def _get_col2cnv(self):
+        """Return the conversion function for each GAF column which is converted or interned."""
+        get_set = self._get_set
+        get_extensions = self._get_extensions
+        get_taxons = self._get_taxons
+        col2cnv = {
+            0: sys.intern,                                    #  0 DB
+            3: self._get_qualifier,                           #  3 Qualifier
+            5: get_set,                                       #  5 DB_Reference
+            6: sys.intern,                                    #  6 Evidence_Code
+            7: get_set,                                       #  7 With_From
+            9: get_set,                                       #  9 DB_Name
+            10: get_set,                                      # 10 DB_Synonym
+            11: sys.intern,                                   # 11 DB_Type
+            12: lambda val: list(get_taxons(val)),            # 12 Taxon: taxon:9606 -> 9606
+            13: self._parse_date,                             # 13 Date   20190406
+        }
+        # The last field on a line ends with a newline
+        if self.is_long:
+            col2cnv[14] = sys.intern                            # 14 Assigned_By
+            col2cnv[15] = get_extensions                        # 15 Extension
+            col2cnv[16] = lambda val: get_set(val.rstrip())     # 16 Gene_Product_Form_ID
+        else:
+            col2cnv[14] = lambda val: get_set(val.rstrip())     # 14 Assigned_By
+        return col2cnv
 
+    def get_gafvals_batch(self, lines, namespaces=None):
+        """Convert a batch of GAF lines into lists of GAF values."""
+        aspect2ns = self.aspect2ns
+        get_gafvals = self.get_gafvals
+        get_all_nss = namespaces is None or namespaces == {'BP', 'MF', 'CC'}
+        flds_lst = [line.split('\t') for line in lines]
+        nspcs = [aspect2ns[flds[8]] for flds in flds_lst]  # 8 GAF Aspect -> BP, MF, or CC
+        return [get_gafvals(flds, nspc) for flds, nspc in zip(flds_lst, nspcs)
+                if get_all_nss or nspc in namespaces]
+
+    def get_gafvals_df(self, dfr, namespaces=None, lnum_first=1):
+        """Convert GAF columns in a DataFrame from string to preferred format.
+
+        lnum_first is the GAF line number of the first row, used to report illegal lines.
+        """
+        import pandas as pd
+        nspcs = dfr['NS'].map(self.aspect2ns)  #  8 GAF Aspect field converted to BP, MF, or CC
+        # An unexpected Aspect is mapped to NaN. Fail loudly, as when reading namedtuples
+        bad = nspcs.isna()
+        if bad.any():
+            raise RuntimeError('UNEXPECTED GAF Aspect({A}) ON GAF LINES({L})'.format(
+                A=' '.join(sorted(set(dfr['NS'][bad]))),
+                L=' '.join(str(i) for i in dfr.index[bad] + lnum_first)))
+        dfr['NS'] = nspcs
+        if namespaces is not None and namespaces != {'BP', 'MF', 'CC'}:
+            dfr = dfr[dfr['NS'].isin(namespaces)].reset_index(drop=True)
+        dfr['Qualifier'] = dfr['Qualifier'].map(self._get_qualifier)  # 3 Qualifier
+        for col in ['DB_Reference', 'With_From', 'DB_Name', 'DB_Synonym']:
+            dfr[col] = dfr[col].map(self._get_set)
+        dfr['Taxon'] = dfr['Taxon'].map(self._do_taxons)  # 12 Taxon
+        dfr['Date'] = pd.to_datetime(dfr['Date'], format='%Y%m%d').dt.date  # 13 Date
         # Version 2.x has these additional fields not found in v1.0
         if self.is_long:
-            flds[15] = get_extensions(flds[15])  # Extensions (or Annotation_Extension)
-            flds[16] = self._get_set(flds[16].rstrip())
+            dfr['Extension'] = dfr['Extension'].map(self._get_extensions)
+            gpfids = dfr['Gene_Product_Form_ID'].str.rstrip()
+            dfr['Gene_Product_Form_ID'] = gpfids.map(self._get_set)
         else:
-            flds[14] = self._get_set(flds[14].rstrip())
-        return flds
+            dfr['Assigned_By'] = dfr['Assigned_By'].str.rstrip().map(self._get_set)
+        return dfr
 
+    # Values in a GAF repeat across many annotations, so parsed values are cached and shared.
+    # Sets are returned as frozensets, so a cached value can not be changed by one annotation.
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _get_qualifier(val):
         """Get qualifiers. Correct for inconsistent capitalization in GAF files"""
-        quals = set()
         if val == '':
-            return quals
+            return _EMPTY_FS
+        quals = set()
         for item in val.split('|'):
             item = item.lower()
             quals.add(item if item != 'not' else 'NOT')
-        return quals
+        return frozenset(quals)
 
     @staticmethod
+    @lru_cache(maxsize=1 << 17)
     def _get_set(val):
         """Further split a GAF value within a single field."""
-        return set(val.split('|')) if val else set()
+        return frozenset(val.split('|')) if val else _EMPTY_FS
 
-    @staticmethod
-    def _get_list(val):
-        """Further split a GAF value within a single field."""
-        return val.split('|') if val else []
+    # Most users never read Extensions, so they are parsed from text only when first used
+    _get_extensions = staticmethod(lru_cache(maxsize=1 << 14)(get_extensions_lazy))
 
     def _chk_fld(self, ntd, name, qty_min=0, qty_max=None):
-        """Further split a GAF value within a single field."""
+        """Check the number of values in a field. Return the annotation, with any values fixed"""
         vals = getattr(ntd, name)
         num_vals = len(vals)
         if num_vals < qty_min:
             self.illegal_lines['MIN QTY'].append(
-                (-1, "FIELD({F}): MIN QUANTITY({Q}) WASN'T MET: {V}".format(
-                    F=name, Q=qty_min, V=vals)))
+                (-1, "FIELD({F}): MIN QUANTITY({Q}) WASN'T MET: {V}",
+                 {'F':name, 'Q':qty_min, 'V':vals}))
         if qty_max is not None:
             if num_vals > qty_max:
                 pat = ("FIELD({F}): LINE({DB_ID} {GO_ID} {Evidence_Code}) "
                        "ERROR: MAX QUANTITY({Q}) EXCEEDED: {V}")
-                err = pat.format(F=name, Q=qty_max, V=vals, **ntd._asdict())
+                kws = dict(ntd._asdict(), F=name, Q=qty_max, V=vals)
                 # TBD: DELETE THIS IF GAF FIXES THEIR FORMAT: -------------------------
                 # https://github.com/geneontology/go-annotation/issues/2659
                 # GAF files keep having errors. Try fixing and print warning if fixed
-                # 2019_0921  1 ERROR IN: gramene_oryza.gaf
-                vals.discard('')
-                # 2019_0921 17 ERROR IN: pamgo_mgrisea.gaf  !Date Generated by GOC: 2019-07-01
-                vals.discard('Similar to sp')
-                vals.discard('Similar to tr')
-                vals.discard('Similarities with tr')
-                vals.discard('Similar to CA3529')
-                vals.discard('Similar to CA3735')
-                vals.discard('Similar to CA2345')
-                # 2019_0921 5 ERROR IN: tair.gaf  !Date Generated by GOC: 2019-07-01
-                vals.discard('Gb')
+                # Values are shared across annotations, so make new values rather than modifying
+                bad = frozenset([
+                    # 2019_0921  1 ERROR IN: gramene_oryza.gaf
+                    '',
+                    # 2019_0921 17 ERROR IN: pamgo_mgrisea.gaf  !Date Generated by GOC: 2019-07-01
+                    'Similar to sp',
+                    'Similar to tr',
+                    'Similarities with tr',
+                    'Similar to CA3529',
+                    'Similar to CA3735',
+                    'Similar to CA2345',
+                    # 2019_0921 5 ERROR IN: tair.gaf  !Date Generated by GOC: 2019-07-01
+                    'Gb',
+                ])
+                vals = type(vals)(v for v in vals if v not in bad)
                 # ----------------------------------------------------------------------
                 if len(vals) > qty_max:
-                    self.illegal_lines['MAX QTY'].append(
-                        (-1, "{ERR}\n{NT}".format(ERR=err, NT=ntd)))
+                    self.illegal_lines['MAX QTY'].append((-1, pat + "\n{NT}", dict(kws, NT=ntd)))
                 else:
-                    print('**WARNING GAF FILE: {ERR}'.format(ERR=err))
+                    print('**WARNING GAF FILE: {ERR}'.format(ERR=pat.format(**kws)))
+                    return ntd._replace(**{name:vals})
+        return ntd
 
     def _chk_qualifier(self, qualifiers, flds, lnum):
         """Check that qualifiers are expected values."""
@@ -303,7 +660,7 @@ class GafData:
         for qual in qualifiers:
             if qual not in AnnoReaderBase.exp_qualifiers:
                 errname = 'UNEXPECTED QUALIFIER({QUAL})'.format(QUAL=qual)
-                self.illegal_lines[errname].append((lnum, "\t".join(flds)))
+                self.illegal_lines[errname].append((lnum, '{L}', {'L':"\t".join(flds)}))
 
     def prt_line_detail(self, prt, line):
         """Print line header and values in a readable format."""
@@ -319,22 +676,39 @@ class GafData:
 
     def _chk_qty_eq_1(self, flds):
         """Check that these fields have only one value: required 1."""
+        # Most annotations have all required values, so check them all at once first
+        if all(self._get_req1(flds)):
+            return
         for col in self.req1:
             if not flds[col]:
                 self.illegal_lines['QTY 1'].append(
-                    (-1, "**ERROR: UNEXPECTED REQUIRED VAL({V}) FOR COL({R}):{H}: ".format(
-                        V=flds[col], H=self.gafhdr[col], R=col)))
-                self.illegal_lines['QTY 1'].append((-1, "{H0}({DB}) {H1}({ID})\n".format(
-                    H0=self.gafhdr[0], DB=flds[0], H1=self.gafhdr[1], ID=flds[1])))
+                    (-1, "**ERROR: UNEXPECTED REQUIRED VAL({V}) FOR COL({R}):{H}: ",
+                     {'V':flds[col], 'H':self.gafhdr[col], 'R':col}))
+                self.illegal_lines['QTY 1'].append(
+                    (-1, "{H0}({DB}) {H1}({ID})\n",
+                     {'H0':self.gafhdr[0], 'DB':flds[0], 'H1':self.gafhdr[1], 'ID':flds[1]}))
 
     def _do_taxons(self, taxon_str):
         """Taxon"""
-        taxons = self._get_list(taxon_str)
-        taxons_str = [v.split(':')[1] for v in taxons] # strip "taxon:"
-        taxons_int = [int(s) for s in taxons_str if s]
-        return taxons_int
+        return list(self._get_taxons(taxon_str))
 
-    def prt_error_summary(self, fout_err):
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _get_taxons(val):
+        """Get taxon IDs as ints: taxon:9606|taxon:1234 -> (9606, 1234)"""
+        if not val:
+            return ()
+        taxons = []
+        for txt in val.split('|'):
+            mtch = GafData.cmptaxon.fullmatch(txt)
+            if mtch is None:
+                raise ValueError('UNEXPECTED GAF Taxon({T})'.format(T=val))
+            # A missing taxon ID (e.g., "NCBITaxon:") is reported later as BAD TAXON by chk
+            if mtch.group(1):
+                taxons.append(int(mtch.group(1)))
+        return tuple(taxons)
+
+    def prt_error_summary(self, fout_err, fin_gaf=None):
         """Print a summary about the GAF file that was read."""
         # Get summary of error types and their counts
         errcnts = []
@@ -344,15 +718,14 @@ class GafData:
             for err_name, errors in self.illegal_lines.items():
                 errcnts.append("  {N:9,} {ERROR}\n".format(N=len(errors), ERROR=err_name))
         # Save error details into a log file
-        fout_log = self._wrlog_details_illegal_gaf(fout_err, errcnts)
+        fout_log = self._wrlog_details_illegal_gaf(fout_err, errcnts, fin_gaf)
         sys.stdout.write("  WROTE GAF ERROR LOG: {LOG}:\n".format(LOG=fout_log))
         for err_cnt in errcnts:
             sys.stdout.write(err_cnt)
 
-    def _wrlog_details_illegal_gaf(self, fout_err, err_cnts):
+    def _wrlog_details_illegal_gaf(self, fout_err, err_cnts, fin_gaf=None):
         """Print details regarding illegal GAF lines seen to a log file."""
-        # fout_err = "{}.log".format(fin_gaf)
-        gaf_base = os.path.basename(fout_err)
+        gaf_base = os.path.basename(fin_gaf if fin_gaf is not None else fout_err)
         with open(fout_err, 'w') as prt:
             prt.write("ILLEGAL GAF ERROR SUMMARY:\n\n")
             for err_cnt in err_cnts:
@@ -364,7 +737,8 @@ class GafData:
                 self.prt_line_detail(prt, line)
                 prt.write("\n\n")
             for error, lines in self.illegal_lines.items():
-                for lnum, line in lines:
+                for lnum, pat, kws in lines:
+                    line = pat.format(**kws)
                     prt.write("**WARNING: GAF LINE ILLEGAL({ERR}): {FIN}[{LNUM}]:\n{L}\n".format(
                         ERR=error, FIN=gaf_base, L=line, LNUM=lnum))
                     self.prt_line_detail(prt, line)
@@ -372,11 +746,57 @@ class GafData:
         return fout_err
 
 
+class GafColumns:
+    """Annotation data stored column-by-column: one list of values for each GAF field."""
+
+    def __init__(self, flds):
+        self.flds = flds
+        self.columns = {fld:[] for fld in flds}
+        self._cols = [self.columns[fld] for fld in flds]
+
+    def __len__(self):
+        return len(self._cols[0]) if self._cols else 0
+
+    def __iter__(self):
+        return self.to_records()
+
+    def append(self, gafvals):
+        """Add the GAF values for one annotation."""
+        if len(gafvals) != len(self._cols):
+            self._raise_numvals(gafvals)
+        for col, val in zip(self._cols, gafvals):
+            col.append(val)
+
+    def extend(self, gafvals_lst):
+        """Add the GAF values for many annotations."""
+        if gafvals_lst:
+            # zip stops at the shortest row, so check that no row has extra or missing values
+            num_cols = len(self._cols)
+            if set(map(len, gafvals_lst)) != {num_cols}:
+                self._raise_numvals(next(v for v in gafvals_lst if len(v) != num_cols))
+            for col, vals in zip(self._cols, zip(*gafvals_lst)):
+                col.extend(vals)
+
+    def _raise_numvals(self, gafvals):
+        """Raise an error for GAF values which do not have one value for each field."""
+        # Same exception as namedtuple._make, so both readers reject the same GAF lines
+        raise TypeError('EXPECTED {N} GAF VALUES, GOT {M}: {VALS}'.format(
+            N=len(self._cols), M=len(gafvals), VALS=gafvals))
+
+    def to_records(self):
+        """Return an iterator of annotation namedtuples, created as needed."""
+        ntobj = cx.namedtuple("ntgafobj", " ".join(self.flds))
+        return map(ntobj._make, zip(*self._cols))
+
+    def to_pandas(self):
+        """Return annotation data in a pandas DataFrame."""
+        import pandas as pd
+        return pd.DataFrame(self.columns, columns=self.flds)
+
+
 class GafHdr:
     """Used to build a GAF header."""
 
-    cmpline = re.compile(r'^!(\w[\w\s-]+:.*)$')
-
     def __init__(self):
         self.gafhdr = []
 
@@ -386,9 +806,20 @@ class GafHdr:
 
     def chkaddhdr(self, line):
         """If this line contains desired header info, save it."""
-        mtch = self.cmpline.search(line)
-        if mtch:
-            self.gafhdr.append(mtch.group(1))
+        # Desired header info has a key and a value: "!gaf-version: 2.1"
+        if line[:1] == '!':
+            txt = line[1:].rstrip('\n')
+            idx = txt.find(':')
+            if idx > 1 and self._is_key(txt[:idx]):
+                self.gafhdr.append(txt)
+
+    @staticmethod
+    def _is_key(key):
+        """Return True if key starts with a word character followed by words, spaces, or dashes"""
+        if not (key[0].isalnum() or key[0] == '_'):
+            return False
+        tail = ''.join(key[1:].split()).replace('-', '').replace('_', '')
+        return not tail or tail.isalnum()
 
 
 # Copyright (C) 2016-present, DV Klopfenstein, H Tang. All rights reserved."
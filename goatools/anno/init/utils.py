@@ -3,6 +3,8 @@
 __copyright__ = "Copyright (C) 2016-2019, DV Klopfenstein, H Tang. All rights reserved."
 __author__ = "DV Klopfenstein"
 
+import gc
+from contextlib import contextmanager
 from datetime import date
 
 
@@ -11,4 +13,19 @@ def get_date_yyyymmdd(yyyymmdd):
     return date(int(yyyymmdd[:4]), int(yyyymmdd[4:6], base=10), int(yyyymmdd[6:], base=10))
 
 
+@contextmanager
+def gc_paused():
+    """Pause cyclic garbage collection while creating many long-lived objects."""
+    # Each annotation allocates several containers (sets, lists, namedtuples). Those
+    # allocations trigger repeated full garbage collections, which re-scan every
+    # annotation read so far, yet free nothing because every annotation is kept.
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
 # Copyright (C) 2016-2019, DV Klopfenstein, H Tang. All rights reserved.
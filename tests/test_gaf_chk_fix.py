@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+"""Test that checking GAF annotations replaces annotations having values which were fixed."""
+
+from __future__ import print_function
+
+__copyright__ = "Copyright (C) 2016-present, DV Klopfenstein, H Tang. All rights reserved."
+__author__ = "DV Klopfenstein"
+
+import os
+from goatools.anno.init.reader_gaf import GafData
+
+REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def test_gaf_chk_fix():
+    """Test that checking GAF annotations replaces annotations having values which were fixed."""
+    objdata = GafData('2.1')
+    ntobj = objdata.get_ntobj()
+    ntd = ntobj(**GafData.get_dfltdict())
+    db_name = frozenset(['Gb', 'Some name'])
+    nts = [ntd._replace(DB_Name=db_name), ntd]
+    fout_err = os.path.join(REPO, 'tests/gaf_chk_fix.err')
+    assert objdata.chk(nts, fout_err)
+    assert not os.path.exists(fout_err)
+    # The fixed DB_Name is stored in a new annotation. Shared values are not modified
+    assert nts[0].DB_Name == frozenset(['Some name']), nts[0]
+    assert db_name == frozenset(['Gb', 'Some name'])
+    assert nts[1] is ntd
+    print('  TEST PASSED')
+
+
+if __name__ == '__main__':
+    test_gaf_chk_fix()
+
+# Copyright (C) 2016-present, DV Klopfenstein, H Tang. All rights reserved.
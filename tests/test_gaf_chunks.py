@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""Test reading a GAF in chunks of annotations."""
+
+from __future__ import print_function
+
+__copyright__ = "Copyright (C) 2016-present, DV Klopfenstein, H Tang. All rights reserved."
+__author__ = "DV Klopfenstein"
+
+import os
+import sys
+import io
+from goatools.anno.gaf_reader import GafReader
+from goatools.anno.gaf_reader import read_gaf_iter
+from tests.utils import get_gaf_vals
+from tests.utils import wr_gaf_badaspect
+
+REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def test_gaf_chunks(prt=sys.stdout):
+    """Test reading a GAF in chunks of annotations."""
+    fin_gaf = os.path.join(REPO, 'data/gaf/goa_human_illegal.gaf')
+    for namespaces in [None, {'BP'}, {'MF', 'CC'}]:
+        nts_all = GafReader(fin_gaf, namespaces=namespaces, prt=prt).associations
+        for chunksize in [1, 10, 68, 1000]:
+            chunks = list(read_gaf_iter(fin_gaf, chunksize, prt, namespaces))
+            assert chunks, 'NO CHUNKS READ: {GAF}'.format(GAF=fin_gaf)
+            assert all(len(nts) <= chunksize for nts in chunks)
+            nts_chunked = [nt for nts in chunks for nt in nts]
+            assert [get_gaf_vals(nt) for nt in nts_chunked] == [get_gaf_vals(nt) for nt in nts_all]
+
+
+def test_gaf_chunks_badline():
+    """Test that the line which can not be read is reported, not the 1st line in its chunk."""
+    fin_gaf = os.path.join(REPO, 'data/gaf/goa_human_illegal.gaf')
+    fout_gaf = os.path.join(REPO, 'tests/gaf_chunks_badline.gaf')
+    lnum_bad = 29
+    lines = wr_gaf_badaspect(fout_gaf, fin_gaf, lnum_bad)
+    for chunksize in [1, 10, 100]:
+        stderr = sys.stderr
+        sys.stderr = io.StringIO()
+        try:
+            list(read_gaf_iter(fout_gaf, chunksize, None))
+        except SystemExit:
+            txt = sys.stderr.getvalue()
+        finally:
+            sys.stderr = stderr
+        assert '{GAF}[{N}]:\n{L}'.format(GAF=fout_gaf, N=lnum_bad, L=lines[lnum_bad-1]) in txt, txt
+    os.remove(fout_gaf)
+
+
+if __name__ == '__main__':
+    test_gaf_chunks()
+    test_gaf_chunks_badline()
+
+# Copyright (C) 2016-present, DV Klopfenstein, H Tang. All rights reserved.
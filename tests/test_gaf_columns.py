@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""Test storing GAF annotation data column-by-column."""
+
+from __future__ import print_function
+
+__copyright__ = "Copyright (C) 2016-present, DV Klopfenstein, H Tang. All rights reserved."
+__author__ = "DV Klopfenstein"
+
+import os
+import sys
+from goatools.anno.gaf_reader import GafReader
+from goatools.anno.init.reader_gaf import InitAssc
+from goatools.anno.init.reader_gaf import GafColumns
+from tests.utils import get_gaf_vals
+
+REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def test_gaf_columns(prt=sys.stdout):
+    """Test storing GAF annotation data column-by-column."""
+    fin_gaf = os.path.join(REPO, 'data/gaf/goa_human_illegal.gaf')
+    for namespaces in [None, {'BP'}, {'MF', 'CC'}]:
+        nts = GafReader(fin_gaf, namespaces=namespaces, prt=prt).associations
+        for chunksize in [7, 100000]:
+            columns = InitAssc(fin_gaf).init_columns(prt, namespaces, chunksize=chunksize)
+            assert len(columns) == len(nts)
+            assert columns.columns['GO_ID'] == [nt.GO_ID for nt in nts]
+            assert columns.columns['Evidence_Code'] == [nt.Evidence_Code for nt in nts]
+            assert [get_gaf_vals(nt) for nt in columns.to_records()] == \
+                   [get_gaf_vals(nt) for nt in nts]
+            dfr = columns.to_pandas()
+            assert list(dfr.columns) == list(nts[0]._fields)
+            assert len(dfr) == len(nts)
+
+
+
+def test_gaf_columns_numvals():
+    """Test that GAF values having extra or missing fields are rejected."""
+    columns = GafColumns(['DB_ID', 'GO_ID'])
+    columns.append(['P12345', 'GO:0003993'])
+    columns.extend([['P12345', 'GO:0000346']])
+    for gafvals_lst in [[['P12345', 'GO:0003993', 'extra']], [['P12345']]]:
+        for add in [columns.append, columns.extend]:
+            try:
+                add(gafvals_lst[0] if add == columns.append else gafvals_lst)
+                assert False, 'GAF VALUES NOT REJECTED: {V}'.format(V=gafvals_lst)
+            except TypeError:
+                pass
+    assert len(columns) == 2
+
+
+if __name__ == '__main__':
+    test_gaf_columns()
+    test_gaf_columns_numvals()
+
+# Copyright (C) 2016-present, DV Klopfenstein, H Tang. All rights reserved.
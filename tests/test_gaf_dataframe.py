@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""Test reading a GAF into a pandas DataFrame."""
+
+from __future__ import print_function
+
+__copyright__ = "Copyright (C) 2016-present, DV Klopfenstein, H Tang. All rights reserved."
+__author__ = "DV Klopfenstein"
+
+import os
+import sys
+from goatools.anno.init.reader_gaf import InitAssc
+from tests.utils import get_gaf_vals
+from tests.utils import wr_gaf_badaspect
+
+REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def test_gaf_dataframe(prt=sys.stdout):
+    """Test reading a GAF into a pandas DataFrame."""
+    fin_gaf = os.path.join(REPO, 'data/gaf/goa_human_illegal.gaf')
+    for namespaces in [None, {'BP'}, {'MF', 'CC'}]:
+        nts = InitAssc(fin_gaf).init_associations(False, None, namespaces, False)
+        objdf = InitAssc(fin_gaf)
+        dfr = objdf.init_dataframe(prt, namespaces)
+        assert objdf.hdr is not None and 'gaf-version' in objdf.hdr
+        assert list(dfr.columns) == list(nts[0]._fields)
+        assert len(dfr) == len(nts), 'DataFrame({D}) != NTs({N})'.format(D=len(dfr), N=len(nts))
+        for ntd, row in zip(nts, dfr.itertuples(index=False, name=None)):
+            act = get_gaf_vals(ntd)
+            exp = get_gaf_vals(ntd._make(row))
+            assert act == exp, '\nNT: {NT}\nDF: {DF}'.format(NT=act, DF=exp)
+
+
+def test_gaf_dataframe_badaspect():
+    """Test that an unexpected GAF Aspect is reported, not stored as NaN."""
+    fin_gaf = os.path.join(REPO, 'data/gaf/goa_human_illegal.gaf')
+    fout_gaf = os.path.join(REPO, 'tests/gaf_dataframe_badaspect.gaf')
+    lnum_bad = 29
+    wr_gaf_badaspect(fout_gaf, fin_gaf, lnum_bad)
+    for namespaces in [None, {'BP'}]:
+        try:
+            InitAssc(fout_gaf).init_dataframe(None, namespaces)
+            assert False, 'UNEXPECTED GAF Aspect NOT REPORTED'
+        except RuntimeError as inst:
+            assert 'LINES({N})'.format(N=lnum_bad) in str(inst), str(inst)
+    os.remove(fout_gaf)
+
+
+if __name__ == '__main__':
+    test_gaf_dataframe()
+    test_gaf_dataframe_badaspect()
+
+# Copyright (C) 2016-present, DV Klopfenstein, H Tang. All rights reserved.
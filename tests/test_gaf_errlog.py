@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""Test that the GAF error log is written to '<GAF>.log', not over the GAF."""
+
+from __future__ import print_function
+
+__copyright__ = "Copyright (C) 2016-present, DV Klopfenstein, H Tang. All rights reserved."
+__author__ = "DV Klopfenstein"
+
+import os
+import shutil
+from goatools.anno.init.reader_gaf import InitAssc
+
+REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def test_gaf_errlog():
+    """Test that the GAF error log is written to '<GAF>.log', not over the GAF."""
+    fin_orig = os.path.join(REPO, 'data/gaf/goa_human_illegal.gaf')
+    fin_gaf = os.path.join(REPO, 'tests/gaf_errlog.gaf')
+    shutil.copyfile(fin_orig, fin_gaf)
+    with open(fin_gaf) as ifstrm:
+        lines = list(ifstrm)
+    objanno = InitAssc(fin_gaf)
+    objanno.init_associations(False, None, None, False)
+    lnum = len(lines)
+    objanno.datobj.ignored.append((lnum, lines[lnum-1]))
+    # pylint: disable=protected-access
+    objanno._prt_error_summary()
+    fout_log = '{GAF}.log'.format(GAF=fin_gaf)
+    with open(fout_log) as ifstrm:
+        txt = ifstrm.read()
+    assert '{GAF}[{N}]:\n{L}'.format(
+        GAF=os.path.basename(fin_gaf), N=lnum, L=lines[lnum-1]) in txt, txt
+    with open(fin_gaf) as ifstrm:
+        assert list(ifstrm) == lines, 'GAF WAS OVERWRITTEN'
+    os.remove(fout_log)
+    os.remove(fin_gaf)
+    print('  TEST PASSED')
+
+
+if __name__ == '__main__':
+    test_gaf_errlog()
+
+# Copyright (C) 2016-present, DV Klopfenstein, H Tang. All rights reserved.
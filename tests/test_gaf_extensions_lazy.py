@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""Test that GAF Extensions are parsed from text only when first used."""
+
+from __future__ import print_function
+
+__copyright__ = "Copyright (C) 2016-present, DV Klopfenstein, H Tang. All rights reserved."
+__author__ = "DV Klopfenstein"
+
+import os
+import pickle
+from goatools.anno.init.reader_gaf import InitAssc
+from goatools.anno.extensions.factory import get_extensions
+
+REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+EXTSTRS = [
+    'has_direct_input(UniProtKB:P37840),occurs_in(GO:0005576)',
+    'part_of(UBERON:0006618),part_of(UBERON:0002302)',
+    'occurs_in(CL:0000988)|occurs_in(CL:0001021)',
+]
+
+
+# pylint: disable=protected-access
+def test_gaf_extensions_lazy():
+    """Test that GAF Extensions are parsed from text only when first used."""
+    fin_gaf = os.path.join(REPO, 'data/gaf/goa_human_illegal.gaf')
+    fout_gaf = os.path.join(REPO, 'tests/gaf_extensions_lazy.gaf')
+    _wr_gaf_exts(fout_gaf, fin_gaf)
+    nts = InitAssc(fout_gaf).init_associations(False, None, None, False)
+    os.remove(fout_gaf)
+    exts = [nt.Extension for nt in nts if nt.Extension is not None]
+    assert {ext.extstr for ext in exts} == set(EXTSTRS)
+    # Extensions are not parsed when the GAF is read
+    assert all(ext._exts is None for ext in exts)
+    for ext in exts:
+        exp = get_extensions(ext.extstr)
+        # Extensions are parsed when first used, giving the same results as eager parsing
+        assert str(ext) == str(exp)
+        assert ext._exts is not None
+        assert ext.get_relations_cnt() == exp.get_relations_cnt()
+        # Extensions can be pickled, as done when reading many GAFs in parallel
+        ext_pkl = pickle.loads(pickle.dumps(ext))
+        assert str(ext_pkl) == str(exp)
+        assert ext_pkl.get_relations_cnt() == exp.get_relations_cnt()
+    print('  TEST PASSED')
+
+
+def _wr_gaf_exts(fout_gaf, fin_gaf):
+    """Write a copy of a GAF, adding an Extension to the first data lines"""
+    with open(fin_gaf) as ifstrm:
+        lines = list(ifstrm)
+    idx = next(i for i, line in enumerate(lines) if line[0] != '!')
+    for extstr in EXTSTRS:
+        flds = lines[idx].split('\t')
+        flds[15] = extstr
+        lines[idx] = '\t'.join(flds)
+        idx += 1
+    with open(fout_gaf, 'w') as prt:
+        prt.write(''.join(lines))
+
+
+if __name__ == '__main__':
+    test_gaf_extensions_lazy()
+
+# Copyright (C) 2016-present, DV Klopfenstein, H Tang. All rights reserved.
@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+"""Test reading only a subset of GAF fields."""
+
+from __future__ import print_function
+
+__copyright__ = "Copyright (C) 2016-present, DV Klopfenstein, H Tang. All rights reserved."
+__author__ = "DV Klopfenstein"
+
+import os
+import sys
+from goatools.anno.init.reader_gaf import InitAssc
+from goatools.anno.gaf_reader import read_gaf_iter
+
+REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def test_gaf_fields(prt=sys.stdout):
+    """Test reading only a subset of GAF fields."""
+    fin_gaf = os.path.join(REPO, 'data/gaf/goa_human_illegal.gaf')
+    fields_lst = [
+        ['GO_ID'],
+        ['DB_Symbol', 'GO_ID'],
+        ['GO_ID', 'NS', 'Qualifier', 'Taxon', 'Date', 'Gene_Product_Form_ID'],
+    ]
+    for namespaces in [None, {'BP'}, {'MF', 'CC'}]:
+        nts_all = InitAssc(fin_gaf).init_associations(False, None, namespaces, False)
+        for fields in fields_lst:
+            exp = [tuple(getattr(nt, fld) for fld in fields) for nt in nts_all]
+            nts = InitAssc(fin_gaf).init_associations(False, prt, namespaces, False, fields=fields)
+            assert nts and list(nts[0]._fields) == fields
+            assert [tuple(nt) for nt in nts] == exp
+            chunks = read_gaf_iter(fin_gaf, 10, prt, namespaces, fields=fields)
+            assert [tuple(nt) for nts in chunks for nt in nts] == exp
+
+
+if __name__ == '__main__':
+    test_gaf_fields()
+
+# Copyright (C) 2016-present, DV Klopfenstein, H Tang. All rights reserved.
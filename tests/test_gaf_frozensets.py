@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+"""Test that GAF set fields are frozensets and that empty fields share one frozenset."""
+
+from __future__ import print_function
+
+__copyright__ = "Copyright (C) 2016-present, DV Klopfenstein, H Tang. All rights reserved."
+__author__ = "DV Klopfenstein"
+
+import os
+from goatools.anno.init.reader_gaf import InitAssc
+from goatools.anno.init.reader_gaf import GafData
+
+REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+SETFLDS = ['Qualifier', 'DB_Reference', 'With_From', 'DB_Name', 'DB_Synonym',
+           'Gene_Product_Form_ID']
+
+
+def test_gaf_frozensets():
+    """Test that GAF set fields are frozensets and that empty fields share one frozenset."""
+    fin_gaf = os.path.join(REPO, 'data/gaf/goa_human_illegal.gaf')
+    nts = InitAssc(fin_gaf).init_associations(False, None, None, False)
+    dflt = GafData.get_dfltdict()
+    empties = set()
+    for ntd in nts + [GafData('2.1').get_ntobj()(**dflt)]:
+        for fld in SETFLDS:
+            val = getattr(ntd, fld)
+            assert isinstance(val, frozenset), '{F}: {V}'.format(F=fld, V=val)
+            if not val:
+                empties.add(id(val))
+    assert len(empties) == 1, 'EMPTY FROZENSETS ARE NOT SHARED'
+    print('  TEST PASSED')
+
+
+if __name__ == '__main__':
+    test_gaf_frozensets()
+
+# Copyright (C) 2016-present, DV Klopfenstein, H Tang. All rights reserved.
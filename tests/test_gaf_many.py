@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+"""Test reading many GAF files in parallel."""
+
+from __future__ import print_function
+
+__copyright__ = "Copyright (C) 2016-present, DV Klopfenstein, H Tang. All rights reserved."
+__author__ = "DV Klopfenstein"
+
+import os
+import sys
+from goatools.anno.init.reader_gaf import InitAssc
+from tests.utils import get_gaf_vals
+
+REPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def test_gaf_many(prt=sys.stdout):
+    """Test reading many GAF files in parallel."""
+    fin_gafs = [os.path.join(REPO, f) for f in [
+        'data/gaf/goa_human_illegal.gaf',
+        'tests/data/gaf_missingsym.mgi',
+        'tests/data/yangRWC/fig1a.gaf',
+        'tests/data/yangRWC/fig2a.gaf']]
+    for namespaces in [None, {'BP'}]:
+        nts_lst = InitAssc.init_associations_many(fin_gafs, 2, prt, namespaces)
+        assert len(nts_lst) == len(fin_gafs)
+        for fin_gaf, nts_act in zip(fin_gafs, nts_lst):
+            nts_exp = InitAssc(fin_gaf).init_associations(False, prt, namespaces, False)
+            assert [get_gaf_vals(nt) for nt in nts_act] == \
+                   [get_gaf_vals(nt) for nt in nts_exp], fin_gaf
+
+
+if __name__ == '__main__':
+    test_gaf_many()
+
+# Copyright (C) 2016-present, DV Klopfenstein, H Tang. All rights reserved.
@@ -50,5 +50,20 @@ def get_termcounts(fin_anno, godag, namespace='all', **kws):
     id2gos = objanno.get_id2gos(namespace=namespace, **kws)
     return TermCounts(godag, id2gos)
 
+def get_gaf_vals(ntd):
+    """Get GAF annotation values for comparing. Extensions are objects, so compare their text"""
+    return tuple(ntd._replace(Extension=str(ntd.Extension)))
+
+def wr_gaf_badaspect(fout_gaf, fin_gaf, lnum):
+    """Write a copy of a GAF having an illegal Aspect on one line. Return the lines written"""
+    with open(fin_gaf) as ifstrm:
+        lines = list(ifstrm)
+    flds = lines[lnum-1].split('\t')
+    flds[8] = 'X'  # Illegal GAF Aspect
+    lines[lnum-1] = '\t'.join(flds)
+    with open(fout_gaf, 'w') as prt:
+        prt.write(''.join(lines))
+    return lines
+
 
 # Copyright (C) 2019-2020, DV Klopfenstein, et al. All rights reserved.